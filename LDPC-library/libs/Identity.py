@@ -18,8 +18,7 @@ class Identity(TannerGraph):
 
         # args describes length of identity matrix
         if len(args) == 1:
-            for i in range(int(args[0])):
-                self.tanner_graph[i] = [i]
+            self.tanner_graph = [[i] for i in range(int(args[0]))]
 
             self.height = int(args[0])
             self.width = self.height
@@ -28,11 +27,10 @@ class Identity(TannerGraph):
         elif len(args) > 1:
 
             max_row = max(args)
-            for i in range(max_row):
-                self.tanner_graph[i] = []
+            self.tanner_graph = [[arg] for arg in args]
 
-            for i in range(len(args)):
-                self.tanner_graph[i] = [args[i]]
+            for i in range(len(args), max_row):
+                self.tanner_graph.append([])
 
             self.height = max_row + 1
             self.width = self.height
@@ -1,7 +1,7 @@
 from libs.TannerGraph import *
 
 '''
-This subclass constructs the tanner_graph dictionary as a dictionary of lists of ProtographEntry objects.
+This subclass constructs the tanner_graph list as a list of lists of ProtographEntry objects.
 This allows each entry to have an entry value not necessarily equal to 1.
 
 Protographs can be read from predefined files in the following format:
@@ -53,7 +53,7 @@ class Protograph(TannerGraph):
     def get_width(self):
         max = -1
         for row in self.tanner_graph:
-            for entry in self.getRow(row):
+            for entry in row:
                 if entry.index > max:
                     max = entry.index
         return max + 1
@@ -101,6 +101,24 @@ class Protograph(TannerGraph):
                 return entry.value
         return 0
 
+    # return:
+    #   int, the largest entry value of the protograph (0 for an empty protograph)
+    def get_max_value(self):
+        max_value = 0
+        for row in self.tanner_graph:
+            for entry in row:
+                if entry.value > max_value:
+                    max_value = entry.value
+        return max_value
+
+    # return:
+    #   list of (row, col, value) tuples, one for every non-zero entry of the protograph
+    def nonzero_entries(self):
+        return [(row, entry.index, entry.value)
+                for row in range(len(self.tanner_graph))
+                for entry in self.getRow(row)
+                if entry.value != 0]
+
     # parameters:
     #   row: int, row of the protograph to analyze
     # return:
@@ -128,6 +146,10 @@ class Protograph(TannerGraph):
     def as_matrix(self):
         return get_matrix_representation(self)
 
+    # Protograph entries carry values greater than 1, which the binary CSR export of TannerGraph cannot represent
+    def to_csr(self):
+        raise RuntimeError("cannot export Protographs in CSR form, must convert to an ldpc code")
+
 
 '''
 Because the superclass as_matrix method cannot work with ProtographEntry objects, Protograph.py must redefine
@@ -143,7 +165,7 @@ def get_matrix_representation(protograph):
     matrix = []
     for i in range(protograph.height):
         row = []
-        if i in protograph.tanner_graph:
+        if i < len(protograph.tanner_graph):
             for j in range(protograph.get_max_index(i) + 1):
                 if protograph.contains_index(j, i):
                     row.append(protograph.get(i, j))
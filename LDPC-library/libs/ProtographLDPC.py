@@ -1,12 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor
+
 from libs.Identity import Identity
 from libs.RegularLDPC import RegularLDPC
 
 from libs.TannerGraph import *
 
+# number of PEG submatrices generated per (factor, weight) pair during one lift before further submatrices of that pair
+# are drawn as randomly permuted copies of the generated ones
+PEG_POOL_SIZE = 8
+
 '''
 A class for the handling of ProtographLDPC matrices in Tanner Graph form
 
-The tanner graph is stored as a dictionary, row indices (check nodes) are mapped to lists of column indices (variable
+The tanner graph is stored as a list, row indices (check nodes) index lists of column indices (variable
 nodes) to indicate bipartite connections
 
 construction arguments:
@@ -26,7 +32,9 @@ defined by the position at row = r / f, column = c / f on the supplied protograp
 
 construction = peg
 This submatrix is a regular LDPC matrix graph whose row and column weightage is defined by the protograph's value
-at row = r / f, column = c / f. The regular matrix is generated using PEG algorithm.
+at row = r / f, column = c / f. The regular matrix is generated using PEG algorithm. Once PEG_POOL_SIZE submatrices of
+the same weight have been generated for a code, further submatrices of that weight are row and column permutations of
+a randomly chosen generated one, which preserves their degrees and girth without running PEG again.
 
 construction = quasi-cyclic
 Given a list of n randomly chosen indices, where n is defined by the value of the protogrpah at (r, c) and n is
@@ -48,9 +56,10 @@ class ProtographLDPC(TannerGraph):
     #   protograph to be lifted
     #   lift factor
     #   construction method
+    #   processes: number of worker processes used to generate submatrices (1 generates them in this process)
     # return:
     #   a fully lifted Protograph LDPC code
-    def __init__(self, protograph, factor, construction):
+    def __init__(self, protograph, factor, construction, processes=1):
         TannerGraph.__init__(self, [protograph, factor], construction=construction)
 
         self.construction = construction
@@ -63,7 +72,7 @@ class ProtographLDPC(TannerGraph):
         self.height = self.protograph.height * self.factor
 
         self.tanner_graph = \
-        ProtographLDPC.expanded_protograph(self.protograph, self.factor, self.construction)
+        ProtographLDPC.expanded_protograph(self.protograph, self.factor, self.construction, processes)
 
     '''
     This method provides the means by which a given protograph can be lifted by a given factor.
@@ -72,30 +81,62 @@ class ProtographLDPC(TannerGraph):
     # parameters:
     #   protograph: Protograph, the protograph code which must be lifted
     #   factor: the factor by which to lift the protograph
+    #   construction: the algorithm by which the submatrices are to be constructed
+    #   processes: number of worker processes used to generate submatrices (1 generates them in this process)
     # return:
     #   ProtographLDPC, fully expanded
     @staticmethod
-    def expanded_protograph(protograph, factor, construction):
+    def expanded_protograph(protograph, factor, construction, processes=1):
+
+        # every submatrix has dimension factor, so no protograph entry may exceed it
+        if protograph.get_max_value() > factor:
+            raise RuntimeError("Invalid protograph value for given lift factor")
 
         expanded = TannerGraph(None)
         for i in range(protograph.height * factor):
             expanded.addRow()
 
-        for r in range(0, len(expanded), factor):
-            for c in range(0, protograph.width * factor, factor):
-
-                if protograph.get(r / factor, c / factor) > factor:
-                    raise RuntimeError("Invalid protograph value for given lift factor")
-
-                elif protograph.get(r / factor, c / factor) == 0:
-                    continue
-
-                else:
-                    expanded.insert(ProtographLDPC.submatrix(
-                        submatrix_construction=construction,
-                        factor=factor,
-                        num_ones_per_row=protograph.get(r / factor, c / factor)
-                    ), [r, c])
+        # zero entries of the protograph leave their submatrix empty, so only non-zero entries are visited
+        entries = protograph.nonzero_entries()
+
+        # generated peg submatrices, shared by the entries of this protograph only
+        pool = {}
+
+        if processes > 1:
+            # peg entries beyond the pool size become permuted copies of pooled graphs, exactly as in the serial path
+            # below. Only the graphs that are actually generated are sent to the workers, the copies are made here
+            # once the pool has been filled
+            generated = []
+            deferred = []
+            counts = {}
+            for pr, pc, value in entries:
+                if construction == "peg" and value > 1:
+                    counts[value] = counts.get(value, 0) + 1
+                    if counts[value] > PEG_POOL_SIZE:
+                        deferred.append((pr, pc, value))
+                        continue
+                generated.append((pr, pc, value))
+
+            # submatrices are independent of each other, so they can be generated in parallel. Every task receives a
+            # seed drawn from this process so the result stays reproducible for a given random seed
+            tasks = [(construction, factor, value, random.randrange(2 ** 32)) for pr, pc, value in generated]
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                submatrices = list(executor.map(make_submatrix, tasks))
+
+            for (pr, pc, value), submatrix in zip(generated, submatrices):
+                if construction == "peg" and value > 1:
+                    pool.setdefault((factor, value), []).append(submatrix)
+                expanded.insert(submatrix, [pr * factor, pc * factor])
+
+            entries = deferred
+
+        for pr, pc, value in entries:
+            expanded.insert(ProtographLDPC.submatrix(
+                submatrix_construction=construction,
+                factor=factor,
+                num_ones_per_row=value,
+                pool=pool
+            ), [pr * factor, pc * factor])
 
         return expanded.tanner_graph
 
@@ -104,13 +145,28 @@ class ProtographLDPC(TannerGraph):
     #   factor: the lifting factor by which the associated protograph is to be lifted
     #   num_ones_per_row: the number of ones per column/row. This is bounded by the lifting factor of the protograph
     #   as all submatrices are of dimension width = factor, height = factor.
+    #   pool: dict, optional, maps (factor, num_ones_per_row) to previously generated peg submatrices for reuse
     # returns:
     #   submatrix: TannerGraph, graph to be inserted into the eventual code
     @staticmethod
-    def submatrix(submatrix_construction="peg", factor=None, num_ones_per_row=None):
+    def submatrix(submatrix_construction="peg", factor=None, num_ones_per_row=None, pool=None):
         if submatrix_construction == "peg":
             if num_ones_per_row > 1:
-                return RegularLDPC([factor, factor, num_ones_per_row], "peg")
+                if pool is None:
+                    return RegularLDPC([factor, factor, num_ones_per_row], "peg")
+
+                generated = pool.setdefault((factor, num_ones_per_row), [])
+                if len(generated) < PEG_POOL_SIZE:
+                    graph = RegularLDPC([factor, factor, num_ones_per_row], "peg")
+                    generated.append(graph)
+                    return graph
+
+                # permuting rows and columns of a generated graph keeps its degrees and girth
+                graph = make_graph(factor, factor, factor)
+                graph.tanner_graph = [row.copy() for row in random.choice(generated).tanner_graph]
+                graph.permute_rows()
+                graph.permute_columns()
+                return graph
             else: # in this case peg returns identity which is bad
                 return Identity(random.sample(range(factor), factor))
 
@@ -124,11 +180,8 @@ class ProtographLDPC(TannerGraph):
             for i in range(num_ones_per_row - 1):
                 # in this case we need to add in more permutations,
                 # but we need to make sure they are non-overlapping
-                while True:
-                    trial_permutation = Identity(random.sample(range(factor), factor))
-                    if not start.overlaps(trial_permutation):
-                        start = start.absorb_nonoverlapping(trial_permutation, [0, 0])
-                        break
+                permutation = Identity(nonoverlapping_permutation(start, factor))
+                start = start.absorb_nonoverlapping(permutation, [0, 0])
             return start
 
         elif submatrix_construction == "quasi-cyclic":
@@ -155,6 +208,26 @@ class ProtographLDPC(TannerGraph):
             raise RuntimeError('Invalid construction method')
 
 
+'''
+Generates a single submatrix in a worker process. The worker's random module is seeded with the task's seed, as worker
+processes would otherwise share or inherit the same random state.
+'''
+
+
+# parameters:
+#   task: tuple (construction, factor, num_ones_per_row, seed) describing the submatrix to generate
+# return:
+#   TannerGraph, the generated submatrix
+def make_submatrix(task):
+    construction, factor, num_ones_per_row, seed = task
+    random.seed(seed)
+    return ProtographLDPC.submatrix(
+        submatrix_construction=construction,
+        factor=factor,
+        num_ones_per_row=num_ones_per_row
+    )
+
+
 '''
 Constructs a submatrix graph from a series of right shifts of an originating index list. This method provides the
 base implementation for the quasi-cyclic and permuted-quasi-cyclic constructions.
@@ -167,9 +240,77 @@ base implementation for the quasi-cyclic and permuted-quasi-cyclic constructions
 # return:
 #   TannerGraph, graph: the graph argument is returned after construction
 def construct_cyclic_submatrix(first_row_indices, graph):
-    for i in range(graph.width):
-        new = first_row_indices.copy()
-        graph.put(i, new)
-        right_shift_row(new, graph.width)
-        first_row_indices = new
+    width = graph.width
+    for i in range(width):
+        # row i is the first row circularly right shifted i times
+        graph.put(i, [(index + i) % width for index in first_row_indices])
     return graph
+
+
+'''
+Generates a random permutation matrix that does not overlap the given graph. The free positions of a submatrix that is
+the sum of k non-overlapping permutations form a (factor - k)-regular bipartite graph, which always contains a perfect
+matching. Such a matching is found directly by assigning rows in random order to random free columns, reassigning
+earlier rows along an augmenting path when a row has no free column left. Unlike drawing random permutations until one
+does not overlap, this always terminates after a single pass over the rows.
+'''
+
+
+# parameters:
+#   graph: TannerGraph, the graph the permutation must not overlap, of dimension factor x factor
+#   factor: int, the width and height of the permutation
+# return:
+#   list(int), permutation where entry i is the column index of the 1 in row i
+def nonoverlapping_permutation(graph, factor):
+    column_of_row = [-1] * factor
+    row_of_column = [-1] * factor
+
+    # free columns of each row, computed the first time a row is visited
+    candidates = {}
+
+    # yields the free columns of a row in random order, shuffling lazily since usually only the first is needed
+    def free_columns(row):
+        if row not in candidates:
+            occupied = set(graph.getRow(row))
+            candidates[row] = [col for col in range(factor) if col not in occupied]
+        free = candidates[row]
+        for i in range(len(free)):
+            j = random.randrange(i, len(free))
+            free[i], free[j] = free[j], free[i]
+            yield free[i]
+
+    for root in random.sample(range(factor), factor):
+
+        # depth first search for an augmenting path starting at root
+        visited = set()
+        parent = {}
+        stack = [(root, free_columns(root))]
+        end = -1
+        while stack and end == -1:
+            row, columns = stack[-1]
+            for col in columns:
+                if col in visited:
+                    continue
+                visited.add(col)
+                parent[col] = row
+                if row_of_column[col] == -1:
+                    end = col
+                else:
+                    stack.append((row_of_column[col], free_columns(row_of_column[col])))
+                break
+            else:
+                stack.pop()
+
+        if end == -1:
+            raise RuntimeError("no non-overlapping permutation exists for the given graph")
+
+        # flips the matched and unmatched edges along the path
+        col = end
+        while col != -1:
+            row = parent[col]
+            previous = column_of_row[row]
+            column_of_row[row] = col
+            row_of_column[col] = row
+            col = previous
+
+    return column_of_row
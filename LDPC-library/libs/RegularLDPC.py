@@ -8,7 +8,7 @@ from libs.TannerGraph import *
 '''
 A class for the handling of Regular LDPC matrices in tanner graph form
 
-The tanner graph is stored as a dictionary, row indices (check nodes) are mapped to lists of column indices (variable
+The tanner graph is stored as a list, row indices (check nodes) index lists of column indices (variable
 nodes) to indicate bipartite connections. Although this class defines regular matrices, it is not a requirement that
 row and column weightages be constant. This is attempted in the respective constructions, but is not always possible
 given the following premise for completely regular codes:
@@ -94,9 +94,7 @@ class RegularLDPC(TannerGraph):
 
             os.remove(degFileName)
             # create the initial empty graph
-            tanner_graph = {}
-            for i in range(m):
-                tanner_graph[i] = []
+            tanner_graph = [[] for _ in range(m)]
 
             # now read the graph generated by PEG
             with open(outFileName) as f:
@@ -110,7 +108,7 @@ class RegularLDPC(TannerGraph):
                     vals = [int(val) for val in line.rstrip('\n').rstrip(' ').split(' ')]
                     for val in vals:
                         if val != 0:  # 0 is used to denote absence of variable node
-                            tanner_graph.get(check_num).append(val - 1)
+                            tanner_graph[check_num].append(val - 1)
                     check_num += 1
                 assert check_num == m
             os.remove(outFileName)
@@ -142,109 +140,128 @@ class RegularLDPC(TannerGraph):
         elif method == "populate-rows":
 
             # constructs initial empty parity check matrix
-            tanner_graph = {}
-            for i in range(m):
-                tanner_graph[i] = []
+            tanner_graph = [[] for _ in range(m)]
+
+            # mirrors the column indices of each row for constant time membership checks
+            row_sets = [set() for _ in range(m)]
 
             width = n
             height = m
 
+            k = n * c
+
             # all possible 1s locations (index in column)
-            available_indices = []
+            available_indices = [i % width for i in range(k - 1, -1, -1)]
 
-            k = n * c
-            for i in range(k - 1, -1, -1):
-                # fills available indices with column indices
-                available_indices.append(i % width)
+            # number of entries left in available_indices, tracked rather than recomputed on every comparison
+            available = k
 
-            placed_entries = 0
             for i in range(height):
+                # bound once per row rather than looked up on every placement
+                row = tanner_graph[i]
+                row_set = row_sets[i]
+
                 for j in range(r):
 
                     # loops through all index positions in available indices, stops when the row does not contain a 1 at
                     # a specified index
                     l = 0
-                    while l < len(available_indices) and tanner_graph.get(i).count(available_indices[l]) == 1:
+                    while l < available and available_indices[l] in row_set:
                         l += 1
 
                     # if all entries have been placed
-                    if l + placed_entries == k:
+                    if l == available:
 
                         # choose a random column index and populate the matrix at that location
-                        random_index = random.choice(range(width))
-                        while tanner_graph.get(i).count(random_index) == 1:
-                            random_index = random.choice(range(width))
+                        random_index = random.randrange(width)
+                        while random_index in row_set:
+                            random_index = random.randrange(width)
 
-                        tanner_graph.get(i).append(random_index)
+                        row.append(random_index)
+                        row_set.add(random_index)
 
                     # if not all entries have been placed
                     else:
 
-                        # choose a random column index
-                        random_index = random.choice(range(len(available_indices)))
-                        while tanner_graph.get(i).count(available_indices[random_index]) != 0 and len(
-                                available_indices) > 1:
-                            random_index = random.choice(range(len(available_indices)))
+                        # choose a random available index, at least one usable index exists as found above. It is
+                        # removed by swapping in the last element, avoiding the cost of shifting the list
+                        random_index = random.randrange(available)
+                        while available_indices[random_index] in row_set:
+                            random_index = random.randrange(available)
+
+                        value = available_indices[random_index]
+                        available_indices[random_index] = available_indices[-1]
+                        available_indices.pop()
+                        available -= 1
 
                         # populate the matrix at specified location
-                        tanner_graph.get(i).append(available_indices.pop(random_index))
-                        placed_entries += 1
+                        row.append(value)
+                        row_set.add(value)
 
             return tanner_graph
 
         # enforces constant column weight
         elif method == "populate-columns":
 
-            # create the initial empty graph
-            tanner_graph = {}
-            for i in range(n):
-                tanner_graph[i] = []
+            # create the initial empty graph, populated row-wise directly so no transpose is needed afterwards
+            tanner_graph = [[] for _ in range(m)]
+
+            # mirrors the row indices of each column for constant time membership checks
+            column_sets = [set() for _ in range(n)]
 
             width = n
             height = m
 
+            k = n * c
+
             # contains all the possible indices for population
-            available_indices = []
+            available_indices = [i % height for i in range(k - 1, -1, -1)]
 
-            k = n * c
-            for i in range(k - 1, -1, -1):
-                # fills available indices with row indices
-                available_indices.append(i % height)
+            # number of entries left in available_indices, tracked rather than recomputed on every comparison
+            available = k
 
-            placed_entries = 0
             for i in range(width):
+                # bound once per column rather than looked up on every placement
+                column_set = column_sets[i]
+
                 for j in range(c):
 
                     # loops through available entries to find an index that is not already populated
                     l = 0
-                    while l < len(available_indices) and tanner_graph.get(i).count(available_indices[l]) == 1:
+                    while l < available and available_indices[l] in column_set:
                         l += 1
 
                     # if all entries have been placed
-                    if placed_entries + l == k:
+                    if l == available:
 
                         # choose a random row index, not restrained by available indices
-                        random_index = random.choice(range(height))
-                        while tanner_graph.get(i).count(random_index) == 1:
-                            random_index = random.choice(range(height))
+                        random_index = random.randrange(height)
+                        while random_index in column_set:
+                            random_index = random.randrange(height)
 
                         # populate matrix at that location
-                        tanner_graph.get(i).append(random_index)
+                        tanner_graph[random_index].append(i)
+                        column_set.add(random_index)
 
                     # if not all 1s have been placed
                     else:
 
-                        # choose a random available index
-                        random_index = random.choice(range(len(available_indices)))
-                        while tanner_graph.get(i).count(available_indices[random_index]) != 0 and len(
-                                available_indices) > 1:
-                            random_index = random.choice(range(len(available_indices)))
+                        # choose a random available index, at least one usable index exists as found above. It is
+                        # removed by swapping in the last element, avoiding the cost of shifting the list
+                        random_index = random.randrange(available)
+                        while available_indices[random_index] in column_set:
+                            random_index = random.randrange(available)
+
+                        value = available_indices[random_index]
+                        available_indices[random_index] = available_indices[-1]
+                        available_indices.pop()
+                        available -= 1
 
                         # populate matrix at that location
-                        tanner_graph.get(i).append(available_indices.pop(random_index))
-                        placed_entries += 1
+                        tanner_graph[value].append(i)
+                        column_set.add(value)
 
-            return transpose(tanner_graph, height)
+            return tanner_graph
         else:
             raise RuntimeError('Invalid construction method')
 
@@ -255,17 +272,19 @@ class RegularLDPC(TannerGraph):
     '''
 
     # parameters:
-    #   submatrices: list of TannerGraph.tanner_graph: dictionary tanner_graphs to be stacked
+    #   submatrices: list of SubGraph objects to be stacked
     #   n: int, the width of each codeword
     #   r: int, the weight of each row of each submatrix in submatrices
     # return:
-    #   a TannerGraph.tanner_graph dictionary containing the entire code constructed from individual submatrices
+    #   a TannerGraph.tanner_graph list containing the entire code constructed from individual submatrices
     @staticmethod
     def merge(submatrices, n, r):
-        merged = {}
+        rows_per_submatrix = n // r
+        merged = [None] * (len(submatrices) * rows_per_submatrix)
         for i in range(len(submatrices)):
-            for j in range(int(n / r)):
-                merged[int(i * n / r + j)] = submatrices[i].map[j]
+            offset = i * rows_per_submatrix
+            for j in range(rows_per_submatrix):
+                merged[offset + j] = submatrices[i].map[j]
         return merged
 
 
@@ -277,19 +296,12 @@ class SubGraph:
     #   r: int, the weight of each row in the cumulative code
     def __init__(self, n, r):
 
-        # creates graph with appropriate no. check nodes
-        self.map = {}
-        for i in range(int(n / r)):
-            self.map[i] = []
-
         # defines all possible indices, randomizes for sparse parity-codeword mapping
         codeword_indices = list(range(0, n))
         random.shuffle(codeword_indices)
 
-        # assigns codeword bits to parity check equations
-        for i in range(int(n / r)):
-            for j in range(int(r)):
-                self.map[i].append(codeword_indices[i * r + j])
+        # assigns consecutive runs of r codeword bits to each parity check equation
+        self.map = {i: codeword_indices[i * r:(i + 1) * r] for i in range(n // r)}
 
     def __repr__(self):
         return str(self.map)
@@ -3,18 +3,19 @@
 A parent of all LDPC codes included in this library
 
 This class provides a structure which all LDPC codes can manipulate in their individual constructions.
-The tanner_graph attribute presents a dictionary where row indices are mapped to lists of column indices.
+The tanner_graph attribute presents a list where each row index holds the list of column indices of that row.
 This structure is populated in the respective subclasses. It is a requirement of all subclasses to define
 the width, height, and tanner_graph attributes of this superclass, as intermediary functions rely on these
 fields to function appropriately
 
 The Tanner (Bipartite) graph representation describes the same code as the corresponding parity check matrix.
-Each row contained within the structural dictionary describes a row in the corresponding matrix: the key value
-indicates the index of the row in the matrix, and the value list describes the locations of the entries
+Each row contained within the structural list describes a row in the corresponding matrix: the position in the list
+indicates the index of the row in the matrix, and the row list describes the locations of the entries
 contained in that matrix row. Unlisted values are assumed to be empty and therefore zero in the matrix representation
 
 """
 
+import array
 import random
 
 
@@ -25,7 +26,7 @@ class TannerGraph:
     #   args: list, contains any possible arguments a subclass might require for their respective constructions
     #   construction: if a subclass implements multiple constructions, this field identifies the construction used by a subclass instance
     # return:
-    #   a TannerGraph object with the tanner_graph dictionary instantiated empty
+    #   a TannerGraph object with the tanner_graph list instantiated empty
     def __init__(self, args, construction=None):
 
         self.args = args
@@ -34,11 +35,11 @@ class TannerGraph:
         self.width = None
         self.height = None
 
-        self.tanner_graph = {}
+        self.tanner_graph = []
 
     # parameters:
-    #   row: int, the row r contained as a key by self.tanner_graph
-    #   value: int, the value which self.tanner_graph.get(row) must append to itself
+    #   row: int, the index of row r in self.tanner_graph
+    #   value: int, the value which self.tanner_graph[row] must append to itself
     # return:
     #   None, appends value internally
     def append(self, row, value):
@@ -58,14 +59,15 @@ class TannerGraph:
     # return:
     #   None
     def addRow(self):
-        self.tanner_graph[len(self.tanner_graph)] = []
+        self.tanner_graph.append([])
 
     # return:
     #   a list of row indices contained in the Graph
     def keys(self):
-        return list(self.tanner_graph.keys())
+        return list(range(len(self.tanner_graph)))
 
-    # WARNING: This function performs insertion without warning if data is being overriden
+    # WARNING: This function performs insertion without warning if data is being overriden. The row is stored by
+    # reference, not copied, so later changes to the passed list are reflected in the graph
     # parameters:
     #   row_index: int, the index of the row to be appended (location along the height of the matrix)
     #   row: list, the actual row to insert
@@ -84,17 +86,17 @@ class TannerGraph:
     #   boolean value: indicating if self and other overlap
     def overlaps(self, other):
 
-        if len(self.tanner_graph.keys()) <= len(other.keys()):
+        if len(self.tanner_graph) <= len(other):
             smaller = self
             larger = other
         else:
             smaller = other
             larger = self
 
+        # a single set per row keeps the check linear in the row weight instead of scanning the larger row per entry
         for i in range(len(smaller)):
-            for entry in smaller.getRow(i):
-                if entry in larger.getRow(i):
-                    return True
+            if not set(larger.getRow(i)).isdisjoint(smaller.getRow(i)):
+                return True
 
         return False
 
@@ -109,21 +111,24 @@ class TannerGraph:
     #   None, all changes are made in self internally
     def insert(self, other, location):  # location: [row, column]
 
-        # clears graph
+        start = location[1]
+        end = location[1] + other.width
+
         for r in range(other.height):
-            c = 0
-            while c < len(self.tanner_graph[r + location[0]]):
-                if location[1] <= self.tanner_graph[r + location[0]][c] < location[1] + other.width:
-                    self.tanner_graph[r + location[0]].pop(c)
-                    c -= 1
+            row = self.tanner_graph[r + location[0]]
 
-                c += 1
+            # clears the row within the scope of other
+            kept = [c for c in row if not start <= c < end]
 
-        # populates graph
-        for r in range(other.height):
+            # populates the row, a set of the present entries avoids searching the row for duplicates
+            present = set(kept)
             for c in other.tanner_graph[r]:
-                if location[1] + c not in self.tanner_graph[location[0] + r]:
-                    self.tanner_graph[location[0] + r].append(location[1] + c)
+                if start + c not in present:
+                    kept.append(start + c)
+                    present.add(start + c)
+
+            # the row is updated in place so existing references to it remain valid
+            row[:] = kept
 
         # no errors thrown for out of bounds
 
@@ -140,7 +145,7 @@ class TannerGraph:
             print("cannot combine matrices, they overlap")
             return None
 
-        if len(self.tanner_graph.keys()) <= len(other.keys()):
+        if len(self.tanner_graph) <= len(other):
             smaller = self
             larger = other
         else:
@@ -169,9 +174,7 @@ class TannerGraph:
 
     # swaps two rows given row indices
     def swap_rows(self, i, j):
-        temp = self.tanner_graph[i]
-        self.tanner_graph[i] = self.tanner_graph[j].copy()
-        self.tanner_graph[j] = temp
+        self.tanner_graph[i], self.tanner_graph[j] = self.tanner_graph[j], self.tanner_graph[i]
 
     # randomly shuffles the columns of the code
     def permute_columns(self, permutation_list=None):
@@ -182,17 +185,25 @@ class TannerGraph:
             if len(permutation_list) != self.width:
                 raise RuntimeError("cannot perform graph row permutation: invalid permutation list")
 
-        # we first transpose the graph and then permute the rows and then transpose again
-        self.tanner_graph = transpose(self.tanner_graph, self.width)
-        self.height, self.width = self.width, self.height
-        self.permute_rows(permutation_list)
+        # applies the swaps permute_rows would perform on the transposed graph to the column labels, so that every row
+        # can be relabeled directly instead of transposing the graph twice
+        order = list(range(self.width))
+        for i in range(len(permutation_list)):
+            j = permutation_list[i]
+            order[i], order[j] = order[j], order[i]
+
+        # order[k] is the column moved to position k
+        new_index = [0] * self.width
+        for k in range(self.width):
+            new_index[order[k]] = k
 
-        self.tanner_graph = transpose(self.tanner_graph, self.width)
-        self.height, self.width = self.width, self.height
+        # rows are kept in ascending column order, as the transposition produced them
+        for r in range(len(self.tanner_graph)):
+            self.tanner_graph[r] = sorted([new_index[c] for c in self.tanner_graph[r]])
 
     # swaps two columns given column indices
     def swap_columns(self, i, j):
-        for row in self.tanner_graph:
+        for row in range(len(self.tanner_graph)):
             for e in range(len(self.getRow(row))):
                 if self.getRow(row)[e] == i:
                     self.tanner_graph[row][e] = j
@@ -204,6 +215,19 @@ class TannerGraph:
     def as_matrix(self):
         return get_matrix_representation(self.tanner_graph)
 
+    # Exports the graph in compressed sparse row form, the layout consumed by most external LDPC decoders. The column
+    # indices of row i are col_idx[row_ptr[i]:row_ptr[i + 1]], in ascending order. Both buffers are typed int arrays,
+    # so they can be handed to array consumers (e.g. numpy.frombuffer) without conversion
+    # return:
+    #   tuple (row_ptr, col_idx) of array.array('i') objects
+    def to_csr(self):
+        row_ptr = array.array('i', [0])
+        col_idx = array.array('i')
+        for row in self.tanner_graph:
+            col_idx.extend(sorted(row))
+            row_ptr.append(len(col_idx))
+        return row_ptr, col_idx
+
 
 # parameters:
 #   row: int, number of rows to initializes in this Tanner Graph
@@ -224,15 +248,15 @@ def make_graph(rows, width, height):
 
 
 '''
-Traverses the dictionary to find identical key values. These correspond to repeated parity check equations which
+Traverses the list to find identical rows. These correspond to repeated parity check equations which
 could undermine the code's performance.
 '''
 
 
 # parameters:
-#   tanner_graph: TannerGraph.tanner_graph dictionary
+#   tanner_graph: TannerGraph.tanner_graph list
 # returns:
-#   boolean indicating whether or not the dict contains repeated list values
+#   boolean indicating whether or not the list contains repeated row values
 def has_repeated_rows(tanner_graph):
     for i in range(0, len(tanner_graph) - 1):
         for j in range(i + 1, len(tanner_graph)):
@@ -249,12 +273,12 @@ diverse methods of matrix construction.
 
 
 # parameters:
-#   tanner_graph: Tanner.tanner_graph dictionary, the graph to be transposed
+#   tanner_graph: Tanner.tanner_graph list, the graph to be transposed
 # returns:
-#   TannerGraph.tanner_graph attribute representing the transposed dictionary
+#   TannerGraph.tanner_graph attribute representing the transposed list
 def transpose(tanner_graph, new_height):
-    new_graph = {i: [] for i in range(new_height)}
-    for row in tanner_graph:
+    new_graph = [[] for _ in range(new_height)]
+    for row in range(len(tanner_graph)):
         for col in tanner_graph[row]:
             new_graph[col].append(row)
     return new_graph
@@ -267,14 +291,14 @@ the appropriate matrix provided the tanner graph
 
 
 # parameters:
-#   tanner_graph: Tanner.tanner_graph dictionary, the dict object for which a representation must be made
+#   tanner_graph: Tanner.tanner_graph list, the list object for which a representation must be made
 # returns:
 #   matrix, list(list()) where 1s represent entries and 0s represent lack of thereof
 def get_matrix_representation(tanner_graph):
     matrix = []
     for i in range(len(tanner_graph)):
         row = []
-        if i in tanner_graph:
+        if tanner_graph[i]:
             for j in range(max(tanner_graph[i]) + 1):
                 if j in tanner_graph[i]:
                     row.append(1)
@@ -286,20 +310,20 @@ def get_matrix_representation(tanner_graph):
 
 
 '''
-Because only rows are directly indexed in the first level of the tanner_graph, the width of a tanner_graph dict
-is not inherently directly stored anywhere. The dictionary's lists must be traversed to find the maximum index.
+Because only rows are directly indexed in the first level of the tanner_graph, the width of a tanner_graph list
+is not inherently directly stored anywhere. The row lists must be traversed to find the maximum index.
 The max + 1 indicates the width of the tanner_graph
 '''
 
 
 # parameters:
-#   tanner_graph: Tanner.tanner_graph dictionary of which the width must be found
+#   tanner_graph: Tanner.tanner_graph list of which the width must be found
 # return:
 #   int, width of the tanner_graph
 def get_width(tanner_graph):
     max = 0
     for row in tanner_graph:
-        for index in tanner_graph[row]:
+        for index in row:
             if index > max:
                 max = index
     return max + 1
@@ -75,6 +75,13 @@ def get_parser():
                         dest='expansion_factor',
                         type=int,
                         help='For protograph codes: protograph expansion factor.')
+    parser.add_argument('--processes',
+                        action='store',
+                        dest='processes',
+                        type=int,
+                        default=1,
+                        help='For protograph codes: number of worker processes used to \
+                             generate submatrices. [default: 1]')
     parser.add_argument('--seed', '-s',
                         action='store',
                         dest='seed',
@@ -120,9 +127,9 @@ def write_graph_to_file(ldpc_code, filepath):
         intio_write(f, ldpc_code.height)
         intio_write(f, ldpc_code.width)
 
-        for key in ldpc_code.tanner_graph:
+        for key in range(len(ldpc_code.tanner_graph)):
             intio_write(f, -(key + 1))
-            for value in sorted(ldpc_code.tanner_graph.get(key)):
+            for value in sorted(ldpc_code.tanner_graph[key]):
                 intio_write(f, (value + 1))
 
         intio_write(f, 0)
@@ -165,7 +172,7 @@ def main():
         protograph_file = args.protograph_file
         factor = args.expansion_factor
         protograph = Protograph(protograph_file)
-        ldpc_code = ProtographLDPC(protograph, factor, construction)
+        ldpc_code = ProtographLDPC(protograph, factor, construction, processes=args.processes)
 
     # write the corresponding graph to specified file in binary
     write_graph_to_file(ldpc_code, pchk_file)